@@ -4,6 +4,11 @@ Demo script to showcase calculator history management features.
 from datetime import datetime, timedelta
 from src.calculator import Calculator
 
+def print_history(history):
+    """Print history records one per line"""
+    for record in history:
+        print(f"{record.timestamp} - {record.operation}: {record.operands} = {record.result}")
+
 def main():
     """Run demo of calculator history features"""
     # Create calculator instance
@@ -17,16 +22,16 @@ def main():
 
     # Show full history
     print("\nFull History:")
-    print(calc.get_history())
+    print_history(calc.get_history())
 
     # Filter by date range
     yesterday = datetime.now() - timedelta(days=1)
     print("\nHistory from yesterday:")
-    print(calc.get_history(start_date=yesterday))
+    print_history(calc.get_history(start_date=yesterday))
 
     # Filter by operation
     print("\nMultiplication operations:")
-    print(calc.get_history(operation='multiply'))
+    print_history(calc.get_history(operation='multiply'))
 
     # Get history stats
     print("\nHistory Statistics:")
@@ -46,7 +51,7 @@ def main():
     # Load history back
     calc.load_history('demo_history')
     print("\nHistory loaded from demo_history.csv")
-    print(calc.get_history())
+    print_history(calc.get_history())
 
 if __name__ == "__main__":
     main()
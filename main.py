@@ -8,11 +8,12 @@ import os
 import sys
 import logging
 from logging.handlers import RotatingFileHandler
-from dotenv import load_dotenv # type: ignore
 
 from src.repl import CalculatorREPL
 from src.plugin_mananger import PluginManager
 
+logger = logging.getLogger(__name__)
+
 def setup_logging() -> None:
     """Configure logging with file and console handlers"""
     log_dir = os.path.join(os.path.dirname(__file__), 'logs')
@@ -24,6 +25,13 @@ def setup_logging() -> None:
     )
     console_handler = logging.StreamHandler()
 
+    # The log format does not use caller, thread or process details, so
+    # skip collecting them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    logging._srcfile = None  # pylint: disable=protected-access
+
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -35,35 +43,36 @@ def main() -> None:
     try:
         # Setup logging
         setup_logging()
-        logging.info("Starting Advanced Calculator")
+        logger.info("Starting Advanced Calculator")
 
         # Load environment variables
+        from dotenv import load_dotenv  # type: ignore # pylint: disable=import-outside-toplevel
         load_dotenv()
-        logging.info("Environment variables loaded")
+        logger.info("Environment variables loaded")
 
         # Initialize plugin system
         plugin_manager = PluginManager()
         plugin_manager.discover_plugins()
-        logging.info("Plugin system initialized")
+        logger.info("Plugin system initialized")
 
         # Start REPL interface
         repl = CalculatorREPL()
         repl.cmdloop()
 
     except FileNotFoundError as e:
-        logging.error("File not found: %s", str(e))
+        logger.error("File not found: %s", str(e))
         sys.exit(1)
     except PermissionError as e:
-        logging.error("Permission denied: %s", str(e))
+        logger.error("Permission denied: %s", str(e))
         sys.exit(1)
     except ImportError as e:
-        logging.error("Failed to import module: %s", str(e))
+        logger.error("Failed to import module: %s", str(e))
         sys.exit(1)
     except KeyboardInterrupt:
-        logging.info("Calculator terminated by user")
+        logger.info("Calculator terminated by user")
         sys.exit(0)
     except Exception as e:  # pylint: disable=broad-except
-        logging.critical("Unexpected error: %s", str(e))
+        logger.critical("Unexpected error: %s", str(e))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -6,12 +6,15 @@ import logging
 
 from src.calculator import Command
 
+logger = logging.getLogger(__name__)
+
 class PowerCommand(Command):
     """Command to calculate power of a number"""
     def execute(self, a: float, b: float) -> float:
         """Calculate base raised to exponent"""
-        logging.info("Calculating %s raised to %s", a, b)
-        return math.pow(float(a), float(b))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Calculating %s raised to %s", a, b)
+        return math.pow(a, b)
 
     def get_description(self) -> str:
         """Get command description"""
@@ -21,11 +24,12 @@ class SquareRootCommand(Command):
     """Command to calculate square root"""
     def execute(self, a: float, b: float = 0) -> float:
         """Calculate square root of a number"""
-        if float(a) < 0:
-            logging.error("Square root of negative number attempted")
+        if a < 0:
+            logger.error("Square root of negative number attempted")
             raise ValueError("Cannot calculate square root of negative number")
-        logging.info("Calculating square root of %s", a)
-        return math.sqrt(float(a))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Calculating square root of %s", a)
+        return math.sqrt(a)
 
     def get_description(self) -> str:
         """Get command description"""
@@ -35,11 +39,12 @@ class LogarithmCommand(Command):
     """Command to calculate logarithm"""
     def execute(self, a: float, b: float = math.e) -> float:
         """Calculate logarithm of a number with given base (default: e)"""
-        if float(a) <= 0:
-            logging.error("Logarithm of non-positive number attempted")
+        if a <= 0:
+            logger.error("Logarithm of non-positive number attempted")
             raise ValueError("Cannot calculate logarithm of non-positive number")
-        logging.info("Calculating logarithm of %s with base %s", a, b)
-        return math.log(float(a), float(b))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Calculating logarithm of %s with base %s", a, b)
+        return math.log(a, b)
 
     def get_description(self) -> str:
         """Get command description"""
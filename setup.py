@@ -14,7 +14,6 @@ setup(
     version="1.0.0",
     packages=find_packages(),
     install_requires=[
-        "pandas>=2.0.0",
         "python-dotenv>=1.0.0",
     ],
     python_requires=">=3.8",
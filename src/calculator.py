@@ -2,16 +2,79 @@
 Core calculator module implementing basic arithmetic operations.
 
 This module provides the base Command class and concrete command implementations
-for basic arithmetic operations. It also manages calculation history using pandas.
+for basic arithmetic operations. It also manages calculation history.
 """
-import warnings
+import csv
 import logging
+import math
+import time
+from collections import Counter, OrderedDict, defaultdict
 from abc import ABC, abstractmethod
+from array import array
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
-import pandas as pd # type: ignore
-# Suppress FutureWarning temporarily
-warnings.simplefilter(action='ignore', category=FutureWarning)
+from enum import IntEnum
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+HISTORY_COLUMNS = ['timestamp', 'operation', 'operands', 'result']
+
+# Buffer size used when reading and writing history files
+CSV_BUFFER_SIZE = 1 << 16
+
+# Maximum number of memoized command results
+RESULT_CACHE_SIZE = 1024
+
+# Commands whose result does not depend on operand order
+COMMUTATIVE_COMMANDS = frozenset({'add', 'multiply'})
+
+# Range of the signed 64-bit timestamp column
+MIN_MICROS, MAX_MICROS = -(1 << 63), (1 << 63) - 1
+
+class Op(IntEnum):
+    """Operation codes stored in history for the built-in commands"""
+    ADD = 0
+    SUBTRACT = 1
+    MULTIPLY = 2
+    DIVIDE = 3
+
+def to_micros(moment: datetime) -> int:
+    """Convert a naive local datetime to epoch microseconds"""
+    return round(moment.timestamp() * 1_000_000)
+
+def bound_micros(moment: datetime) -> int:
+    """Convert a datetime filter bound to epoch microseconds.
+
+    Bounds too close to datetime.min or datetime.max to convert in the local
+    timezone are clamped to the smallest or largest representable value.
+    """
+    try:
+        return to_micros(moment)
+    except (ValueError, OverflowError, OSError):
+        return MAX_MICROS if moment.year > 1970 else MIN_MICROS
+
+def from_micros(micros: int) -> datetime:
+    """Convert epoch microseconds to a naive local datetime"""
+    return datetime.fromtimestamp(micros / 1_000_000)
+
+class HistoryRecord(NamedTuple):
+    """Single calculation stored in the history"""
+    timestamp: datetime
+    operation: str
+    a: float
+    b: float
+    result: float
+
+    @property
+    def operands(self) -> str:
+        """Operands formatted as a tuple string"""
+        return f"({self.a}, {self.b})"
+
+def parse_operands(operands: str) -> Tuple[float, float]:
+    """Parse an operands string of the form (a, b)"""
+    a, b = operands.strip('()').split(',')
+    return float(a), float(b)
 
 class Command(ABC):
     """Abstract base class for calculator commands"""
@@ -27,8 +90,9 @@ class AddCommand(Command):
     """Command to add two numbers"""
     def execute(self, a: float, b: float) -> float:
         """Add two numbers"""
-        logging.info("Adding %s and %s", a, b)
-        return float(a) + float(b)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Adding %s and %s", a, b)
+        return a + b
 
     def get_description(self) -> str:
         """Get command description"""
@@ -38,8 +102,9 @@ class SubtractCommand(Command):
     """Command to subtract two numbers"""
     def execute(self, a: float, b: float) -> float:
         """Subtract second number from first"""
-        logging.info("Subtracting %s from %s", b, a)
-        return float(a) - float(b)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Subtracting %s from %s", b, a)
+        return a - b
 
     def get_description(self) -> str:
         """Get command description"""
@@ -49,8 +114,9 @@ class MultiplyCommand(Command):
     """Command to multiply two numbers"""
     def execute(self, a: float, b: float) -> float:
         """Multiply two numbers"""
-        logging.info("Multiplying %s and %s", a, b)
-        return float(a) * float(b)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Multiplying %s and %s", a, b)
+        return a * b
 
     def get_description(self) -> str:
         """Get command description"""
@@ -60,77 +126,170 @@ class DivideCommand(Command):
     """Command to divide two numbers"""
     def execute(self, a: float, b: float) -> float:
         """Divide first number by second"""
-        if float(b) == 0:
-            logging.error("Division by zero attempted")
+        if b == 0.0:
+            logger.error("Division by zero attempted")
             raise ZeroDivisionError("Cannot divide by zero")
-        logging.info("Dividing %s by %s", a, b)
-        return float(a) / float(b)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Dividing %s by %s", a, b)
+        return a / b
 
     def get_description(self) -> str:
         """Get command description"""
         return "Division"
 
-class Calculator:
+# Built-in commands whose results depend only on their operands
+MEMOIZED_COMMANDS = (AddCommand, SubtractCommand, MultiplyCommand, DivideCommand)
+
+class Calculator:  # pylint: disable=too-many-instance-attributes
     """Calculator class implementing command pattern and history management"""
     _instance = None
 
     def __new__(cls) -> 'Calculator':
         """Create or return singleton instance"""
         if cls._instance is None:
-            instance = super().__new__(cls)
-            instance._commands = {
-                'add': AddCommand(),
-                'subtract': SubtractCommand(),
-                'multiply': MultiplyCommand(),
-                'divide': DivideCommand()
-            }
-            instance._history = pd.DataFrame(
-                columns=['timestamp', 'operation', 'operands', 'result']
-            )
-            cls._instance = instance
+            cls._instance = cls._new_instance()
         return cls._instance
 
+    @classmethod
+    def _new_instance(cls) -> 'Calculator':
+        """Create and initialize a calculator without touching the singleton"""
+        instance = super().__new__(cls)
+        instance._commands = {
+            'add': AddCommand(),
+            'subtract': SubtractCommand(),
+            'multiply': MultiplyCommand(),
+            'divide': DivideCommand()
+        }
+        instance._op_names = [op.name.lower() for op in Op]
+        instance._op_codes = {name: code for code, name in enumerate(instance._op_names)}
+        instance._result_cache = OrderedDict()
+        instance._reset_history()
+        return instance
+
+    @classmethod
+    def _new_for_tests(cls) -> 'Calculator':
+        """Create an independent calculator so tests do not share singleton state"""
+        return cls._new_instance()
+
     def execute_command(self, command_name: str, a: float, b: float) -> float:
         """Execute a command by name with given operands"""
-        command = self._commands.get(command_name.lower())
+        name = command_name.lower()
+        command = self._commands.get(name)
         if not command:
             raise ValueError(f"Unknown command: {command_name}")
 
-        result = command.execute(float(a), float(b))
-        self._add_to_history(command_name, (float(a), float(b)), result)
+        a, b = float(a), float(b)
+        # Only memoize the pure built-in commands; plugins may not be pure, and
+        # zero operands are skipped because 0.0 and -0.0 compare equal as keys
+        if type(command) not in MEMOIZED_COMMANDS or a == 0.0 or b == 0.0:
+            result = command.execute(a, b)
+        else:
+            key = (name, b, a) if name in COMMUTATIVE_COMMANDS and b < a else (name, a, b)
+            result = self._result_cache.get(key)
+            if result is None:
+                result = command.execute(a, b)
+                self._result_cache[key] = result
+                if len(self._result_cache) > RESULT_CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+            else:
+                self._result_cache.move_to_end(key)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Using cached result for %s of %s and %s", name, a, b)
+
+        self._add_to_history(self._op_code(name), a, b, result)
         return result
 
-    def _add_to_history(self, operation: str, operands: Tuple[float, float], result: float) -> None:
+    def _op_code(self, operation: str) -> int:
+        """Get the code for an operation name, assigning a new one if needed"""
+        code = self._op_codes.get(operation)
+        if code is None:
+            code = len(self._op_names)
+            self._op_names.append(operation)
+            self._op_codes[operation] = code
+        return code
+
+    def _add_to_history(self, op_code: int, a: float, b: float, result: float) -> None:
         """Add calculation to history"""
-        new_record = pd.DataFrame({
-            'timestamp': [datetime.now()],
-            'operation': [operation],
-            'operands': [str(operands)],
-            'result': [result]
-        })
-        self._history = pd.concat([self._history, new_record], ignore_index=True)
+        self._append(time.time_ns() // 1000, op_code, a, b, result)
+
+    def _append(self, timestamp: int, op_code: int, a: float, b: float, result: float) -> None:
+        """Append an entry to the history columns and update statistics"""
+        # Convert first so a non-real result cannot leave the columns out of step
+        result = float(result)
+        self._by_op[op_code].append(len(self._results))
+        self._op_counts[op_code] += 1
+        self._result_sum += result
+        self._timestamps.append(timestamp)
+        self._ops.append(op_code)
+        self._a.append(a)
+        self._b.append(b)
+        self._results.append(result)
+
+    def _rebuild_stats(self) -> None:
+        """Recompute statistics and the operation index from the history columns"""
+        self._op_counts = Counter(self._ops)
+        self._by_op = defaultdict(list)
+        for index, op_code in enumerate(self._ops):
+            self._by_op[op_code].append(index)
+        self._result_sum = math.fsum(self._results)
+
+    def _to_record(self, index: int) -> HistoryRecord:
+        """Build the HistoryRecord for the entry at index"""
+        return HistoryRecord(
+            from_micros(self._timestamps[index]),
+            self._op_names[self._ops[index]],
+            self._a[index],
+            self._b[index],
+            self._results[index]
+        )
+
+    def _reset_history(self) -> None:
+        """Reset history and running statistics"""
+        # History is stored column-wise; timestamps are epoch microseconds
+        self._timestamps = array('q')
+        self._ops = array('I')
+        self._a = array('d')
+        self._b = array('d')
+        self._results = array('d')
+        self._op_counts = Counter()
+        self._by_op = defaultdict(list)
+        self._result_sum = 0.0
 
     def get_history(self, start_date: Optional[datetime] = None,
                    end_date: Optional[datetime] = None,
                    operation: Optional[str] = None,
-                   limit: Optional[int] = None) -> pd.DataFrame:
+                   limit: Optional[int] = None) -> List[HistoryRecord]:
         """Get calculation history with optional filters"""
-        history = self._history.copy()
+        if limit is not None and limit < 0:
+            raise ValueError(f"Limit must not be negative: {limit}")
+        count = len(self._results)
+        if not (start_date or end_date or operation):
+            first = max(count - limit, 0) if limit else 0
+            return [self._to_record(index) for index in range(first, count)]
 
-        if start_date:
-            history = history[history['timestamp'] >= start_date]
-        if end_date:
-            history = history[history['timestamp'] <= end_date]
+        indices: Iterable[int] = range(count - 1, -1, -1)
         if operation:
-            history = history[history['operation'] == operation.lower()]
-        if limit:
-            history = history.tail(limit)
-
+            op_code = self._op_codes.get(operation.lower())
+            if op_code not in self._by_op:
+                return []
+            indices = reversed(self._by_op[op_code])
+        start = bound_micros(start_date) if start_date else None
+        end = bound_micros(end_date) if end_date else None
+        timestamps = self._timestamps
+        # Scan newest first so a limit can stop the scan early
+        matches = (
+            index for index in indices
+            if (start is None or timestamps[index] >= start)
+            and (end is None or timestamps[index] <= end)
+        )
+        history = [self._to_record(index) for index in islice(matches, limit or None)]
+        history.reverse()
         return history
 
     def get_history_stats(self) -> Dict[str, Any]:
         """Get statistics about calculation history"""
-        if self._history.empty:
+        count = len(self._results)
+        if not count:
             return {
                 'total_calculations': 0,
                 'most_used_operation': None,
@@ -140,37 +299,81 @@ class Calculator:
                 'unique_operations': 0
             }
 
-        operations_count = self._history['operation'].value_counts().to_dict()
-        most_used = max(operations_count.items(), key=lambda x: x[1])[0]
+        operations_count = {
+            self._op_names[op_code]: count
+            for op_code, count in self._op_counts.most_common()
+        }
 
         return {
-            'total_calculations': len(self._history),
-            'most_used_operation': most_used,
-            'average_result': self._history['result'].mean(),
+            'total_calculations': count,
+            'most_used_operation': next(iter(operations_count)),
+            'average_result': self._result_sum / count,
             'operations_count': operations_count,
-            'last_calculation': self._history.iloc[-1]['timestamp'],
+            'last_calculation': from_micros(self._timestamps[-1]),
             'unique_operations': len(operations_count)
         }
 
     def clear_history(self) -> None:
         """Clear calculation history"""
-        self._history = pd.DataFrame(columns=['timestamp', 'operation', 'operands', 'result'])
+        self._reset_history()
 
     def save_history(self, filename: str) -> None:
         """Save history to CSV file"""
         if not filename.endswith('.csv'):
             filename += '.csv'
-        self._history.to_csv(filename, index=False)
+        with open(filename, 'w', newline='', encoding='utf-8',
+                  buffering=CSV_BUFFER_SIZE) as file:
+            writer = csv.writer(file, lineterminator='\n')
+            writer.writerow(HISTORY_COLUMNS)
+            writer.writerows(
+                (
+                    from_micros(timestamp).isoformat(sep=' '),
+                    self._op_names[op_code],
+                    f"({a}, {b})",
+                    result
+                )
+                for timestamp, op_code, a, b, result in zip(
+                    self._timestamps, self._ops, self._a, self._b, self._results
+                )
+            )
 
     def load_history(self, filename: str) -> None:
         """Load history from CSV file"""
         if not filename.endswith('.csv'):
             filename += '.csv'
-        self._history = pd.read_csv(filename, parse_dates=['timestamp'])
+        with open(filename, newline='', encoding='utf-8',
+                  buffering=CSV_BUFFER_SIZE) as file:
+            reader = csv.reader(file)
+            header = next(reader, HISTORY_COLUMNS)
+            ts_col, op_col, operands_col, result_col = (
+                header.index(column) for column in HISTORY_COLUMNS
+            )
+            timestamps, ops = array('q'), array('I')
+            a_values, b_values, results = array('d'), array('d'), array('d')
+            # New operation names are only registered once the file has parsed
+            op_codes = dict(self._op_codes)
+            for row in reader:
+                if not row:
+                    continue
+                a, b = parse_operands(row[operands_col])
+                timestamps.append(to_micros(datetime.fromisoformat(row[ts_col])))
+                ops.append(op_codes.setdefault(row[op_col], len(op_codes)))
+                a_values.append(a)
+                b_values.append(b)
+                results.append(float(row[result_col]))
+
+        # Only replace the current history once the whole file has parsed
+        self._op_names.extend(islice(op_codes, len(self._op_names), None))
+        self._op_codes = op_codes
+        self._timestamps, self._ops = timestamps, ops
+        self._a, self._b, self._results = a_values, b_values, results
+        self._rebuild_stats()
 
     def register_command(self, name: str, command: Command) -> None:
         """Register a new command"""
         self._commands[name.lower()] = command
+        self._op_code(name.lower())
+        self._result_cache.clear()
 
     def get_available_commands(self) -> List[str]:
         """Get list of available command names"""
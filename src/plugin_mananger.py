@@ -7,10 +7,13 @@ It handles plugin discovery, loading, and registration with the calculator.
 import os
 import importlib.util
 import logging
-from typing import Dict, Optional, Type
+from types import ModuleType
+from typing import Dict, Optional, Tuple
 
 from .calculator import Command
 
+logger = logging.getLogger(__name__)
+
 class PluginManagerError(Exception):
     """Base exception class for plugin manager errors"""
 
@@ -23,13 +26,16 @@ class PluginDiscoveryError(PluginManagerError):
 class PluginManager:
     """Singleton class for managing calculator plugins"""
     _instance: Optional['PluginManager'] = None
-    _plugins: Dict[str, Type[Command]] = {}
+    _plugins: Dict[str, Command] = {}
+    # Loaded plugin modules keyed by path, with the file mtime they were loaded at
+    _module_cache: Dict[str, Tuple[float, ModuleType]] = {}
 
     def __new__(cls) -> 'PluginManager':
         """Create or return the singleton instance"""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._plugins = {}  # Initialize in __new__
+            cls._instance._module_cache = {}
         return cls._instance
 
     def discover_plugins(self, plugin_dir: Optional[str] = None) -> None:
@@ -43,33 +49,52 @@ class PluginManager:
         if not os.path.exists(plugin_dir):
             raise PluginDiscoveryError(f"Plugin directory not found: {plugin_dir}")
 
-        for filename in os.listdir(plugin_dir):
-            if filename.endswith('.py') and not filename.startswith('__'):
-                plugin_path = os.path.join(plugin_dir, filename)
+        with os.scandir(plugin_dir) as entries:
+            for entry in entries:
+                filename = entry.name
+                if not filename.endswith('.py') or filename.startswith('__'):
+                    continue
+                if not entry.is_file():
+                    continue
                 try:
-                    self._load_plugin(plugin_path)
+                    self._load_plugin(entry.path)
                 except Exception as e:
-                    logging.error("Failed to load plugin %s: %s", filename, str(e))
+                    logger.error("Failed to load plugin %s: %s", filename, str(e))
                     raise PluginLoadError(f"Failed to load {filename}: {str(e)}") from e
 
     def _load_plugin(self, plugin_path: str) -> None:
         """Load a plugin module and register its commands"""
-        module_name = os.path.splitext(os.path.basename(plugin_path))[0]
-        spec = importlib.util.spec_from_file_location(module_name, plugin_path)
-        if spec is None or spec.loader is None:
-            raise PluginLoadError(f"Invalid plugin file: {plugin_path}")
+        try:
+            mtime: Optional[float] = os.path.getmtime(plugin_path)
+        except OSError:
+            mtime = None
+
+        cached = self._module_cache.get(plugin_path)
+        if cached is not None and mtime is not None and cached[0] == mtime:
+            module = cached[1]
+        else:
+            module_name = os.path.splitext(os.path.basename(plugin_path))[0]
+            spec = importlib.util.spec_from_file_location(module_name, plugin_path)
+            if spec is None or spec.loader is None:
+                raise PluginLoadError(f"Invalid plugin file: {plugin_path}")
 
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            if mtime is not None:
+                self._module_cache[plugin_path] = (mtime, module)
 
         for item_name in dir(module):
             item = getattr(module, item_name)
             if (isinstance(item, type) and
                 issubclass(item, Command) and
                 item is not Command):
-                self._plugins[item_name.lower()] = item
-                logging.info("Loaded plugin command: %s", item_name)
+                self._plugins[item_name.lower()] = item()
+                logger.info("Loaded plugin command: %s", item_name)
 
-    def get_plugin(self, name: str) -> Optional[Type[Command]]:
+    def get_plugin(self, name: str) -> Optional[Command]:
         """Get a plugin command by name"""
         return self._plugins.get(name.lower())
+
+    def get_plugins(self) -> Dict[str, Command]:
+        """Get all loaded plugin commands keyed by name"""
+        return dict(self._plugins)
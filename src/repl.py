@@ -5,24 +5,35 @@ This module provides a command-line interface using Python's cmd module.
 It implements the Facade pattern to simplify interaction with the calculator.
 """
 import cmd
+import csv
 import shlex
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any
 
 from src.plugin_mananger import PluginManager
 from .calculator import Calculator
 
+# Fallback formats for dates that are not ISO 8601
+DATE_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%Y"
+)
+
+@lru_cache(maxsize=128)
 def parse_date(date_str: str) -> datetime:
     """Parse date string in various formats"""
-    formats = [
-        "%Y-%m-%d",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%d %H:%M",
-        "%m/%d/%Y",
-        "%m/%d/%Y %H:%M:%S",
-        "%m/%d/%Y %H:%M"
-    ]
-    for fmt in formats:
+    try:
+        parsed = datetime.fromisoformat(date_str)
+        # History timestamps are naive, so only accept naive dates here
+        if parsed.tzinfo is None:
+            return parsed
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt)
         except ValueError:
@@ -72,46 +83,47 @@ class CalculatorREPL(cmd.Cmd):  # pylint: disable=too-many-public-methods
         self.calculator = Calculator()
         self.plugin_manager = PluginManager()
         self.plugin_manager.discover_plugins()
-
-    def do_add(self, arg: str) -> None:
-        """Add two numbers: add <number1> <number2>"""
+        for name, plugin in self.plugin_manager.get_plugins().items():
+            self.calculator.register_command(name, plugin)
+        self._dispatch = {
+            name[3:]: getattr(self, name) for name in dir(self) if name.startswith('do_')
+        }
+
+    def onecmd(self, line: str) -> bool:
+        """Dispatch a command line, looking up do_* handlers directly"""
+        parts = line.split(None, 1)
+        handler = self._dispatch.get(parts[0]) if parts else None
+        if handler is None:
+            # Empty lines, '?', '!' and plugin commands go through cmd.Cmd
+            return super().onecmd(line)
+        self.lastcmd = '' if parts[0] == 'EOF' else line.strip()
+        return handler(parts[1].strip() if len(parts) > 1 else '')
+
+    def _binary_operation(self, name: str, arg: str) -> None:
+        """Run a two-operand calculator command and print the result"""
         try:
-            num1, num2 = map(float, shlex.split(arg))
-            result = self.calculator.execute_command('add', num1, num2)
+            num1, num2 = map(float, arg.split())
+            result = self.calculator.execute_command(name, num1, num2)
             print(f"Result: {result}")
-        except ValueError as e:
+        except (ValueError, ZeroDivisionError) as e:
             print(f"Error: {str(e)}")
-            print("Usage: add <number1> <number2>")
+            print(f"Usage: {name} <number1> <number2>")
+
+    def do_add(self, arg: str) -> None:
+        """Add two numbers: add <number1> <number2>"""
+        self._binary_operation('add', arg)
 
     def do_subtract(self, arg: str) -> None:
         """Subtract second number from first: subtract <number1> <number2>"""
-        try:
-            num1, num2 = map(float, shlex.split(arg))
-            result = self.calculator.execute_command('subtract', num1, num2)
-            print(f"Result: {result}")
-        except ValueError as e:
-            print(f"Error: {str(e)}")
-            print("Usage: subtract <number1> <number2>")
+        self._binary_operation('subtract', arg)
 
     def do_multiply(self, arg: str) -> None:
         """Multiply two numbers: multiply <number1> <number2>"""
-        try:
-            num1, num2 = map(float, shlex.split(arg))
-            result = self.calculator.execute_command('multiply', num1, num2)
-            print(f"Result: {result}")
-        except ValueError as e:
-            print(f"Error: {str(e)}")
-            print("Usage: multiply <number1> <number2>")
+        self._binary_operation('multiply', arg)
 
     def do_divide(self, arg: str) -> None:
         """Divide first number by second: divide <number1> <number2>"""
-        try:
-            num1, num2 = map(float, shlex.split(arg))
-            result = self.calculator.execute_command('divide', num1, num2)
-            print(f"Result: {result}")
-        except (ValueError, ZeroDivisionError) as e:
-            print(f"Error: {str(e)}")
-            print("Usage: divide <number1> <number2>")
+        self._binary_operation('divide', arg)
 
     def do_history(self, arg: str) -> None:
         """View calculation history with optional filters.
@@ -122,15 +134,14 @@ class CalculatorREPL(cmd.Cmd):  # pylint: disable=too-many-public-methods
             args = parse_history_args(shlex.split(arg))
             history = self.calculator.get_history(**args)
 
-            if history.empty:
+            if not history:
                 print("No calculations found")
                 return
 
-            for _, row in history.iterrows():
-                print(
-                    f"{row['timestamp']} - {row['operation']}: "
-                    f"{row['operands']} = {row['result']}"
-                )
+            print("\n".join(
+                f"{timestamp} - {operation}: ({a}, {b}) = {result}"
+                for timestamp, operation, a, b, result in history
+            ))
 
         except ValueError as e:
             print(f"Error: {str(e)}")
@@ -176,7 +187,7 @@ class CalculatorREPL(cmd.Cmd):  # pylint: disable=too-many-public-methods
             filename = shlex.split(arg)[0]
             self.calculator.load_history(filename)
             print(f"History loaded from {filename}.csv")
-        except (IndexError, FileNotFoundError) as e:
+        except (IndexError, FileNotFoundError, ValueError, csv.Error) as e:
             print(f"Error: {str(e)}")
             print("Usage: load_history <filename>")
 
@@ -208,16 +219,13 @@ class CalculatorREPL(cmd.Cmd):  # pylint: disable=too-many-public-methods
             return
 
         try:
-            args = shlex.split(line)[1:]
+            args = line.split()[1:]
             if len(args) < 1:
                 print(f"Error: {command} requires at least one argument")
                 return
 
-            cmd_instance = plugin()
-            if len(args) == 1:
-                result = cmd_instance.execute(float(args[0]), 0)
-            else:
-                result = cmd_instance.execute(float(args[0]), float(args[1]))
+            second = float(args[1]) if len(args) > 1 else 0
+            result = self.calculator.execute_command(command, float(args[0]), second)
             print(f"Result: {result}")
 
         except ValueError as e:
@@ -0,0 +1,44 @@
+"""
+Shared pytest fixtures for the calculator test suite.
+"""
+import io
+import pytest
+import src.calculator
+from src.calculator import Calculator
+
+class MemoryFile(io.StringIO):
+    """Text buffer that stores its contents under a path when closed"""
+    def __init__(self, files, path):
+        super().__init__()
+        self._files = files
+        self._path = path
+
+    def close(self):
+        """Store the written text before closing the buffer"""
+        if not self.closed:
+            self._files[self._path] = self.getvalue()
+        super().close()
+
+@pytest.fixture
+def calc():
+    """Fresh calculator that is not shared with other tests"""
+    return Calculator._new_for_tests()  # pylint: disable=protected-access
+
+@pytest.fixture
+def memory_files(monkeypatch):
+    """Route history file I/O in src.calculator to an in-memory dict of path -> text"""
+    files = {}
+
+    def fake_open(path, mode='r', buffering=-1, encoding=None, newline=None):
+        # Hold callers to the arguments the real CSV files need
+        assert encoding == 'utf-8' and newline == '', (encoding, newline)
+        assert buffering != 0, buffering
+        path = str(path)
+        if 'w' in mode:
+            return MemoryFile(files, path)
+        if path not in files:
+            raise FileNotFoundError(path)
+        return io.StringIO(files[path])
+
+    monkeypatch.setattr(src.calculator, 'open', fake_open, raising=False)
+    return files
@@ -4,43 +4,46 @@ Test module for the calculator functionality.
 This module tests core calculator operations, history management,
 and error handling.
 """
+import math
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
 import pytest
 from src.calculator import (
     Calculator, Command, AddCommand, SubtractCommand,
     MultiplyCommand, DivideCommand
 )
 
-def test_calculator_singleton():
+def test_calculator_singleton(calc):
     """Test calculator singleton pattern"""
     calc1 = Calculator()
     calc2 = Calculator()
     assert calc1 is calc2
+    assert calc is not calc1
     # Access to protected members is necessary for testing singleton implementation
     assert calc1._commands is calc2._commands  # pylint: disable=protected-access
 
-def test_add_command():
-    """Test addition command"""
-    cmd = AddCommand()
-    assert cmd.execute(2, 3) == 5
-    assert cmd.get_description() == "Addition"
-
-def test_subtract_command():
-    """Test subtraction command"""
-    cmd = SubtractCommand()
-    assert cmd.execute(5, 3) == 2
-    assert cmd.get_description() == "Subtraction"
-
-def test_multiply_command():
-    """Test multiplication command"""
-    cmd = MultiplyCommand()
-    assert cmd.execute(4, 3) == 12
-    assert cmd.get_description() == "Multiplication"
-
-def test_divide_command():
-    """Test division command"""
-    cmd = DivideCommand()
-    assert cmd.execute(6, 2) == 3
-    assert cmd.get_description() == "Division"
+def test_import_leaves_warning_filters_alone():
+    """Test importing the calculator does not change global warning filters"""
+    code = (
+        "import warnings; before = list(warnings.filters); "
+        "import src.calculator; assert warnings.filters == before"
+    )
+    repo_root = Path(__file__).resolve().parent.parent
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+@pytest.mark.parametrize("cmd_cls,a,b,expected,description", [
+    (AddCommand, 2, 3, 5, "Addition"),
+    (SubtractCommand, 5, 3, 2, "Subtraction"),
+    (MultiplyCommand, 4, 3, 12, "Multiplication"),
+    (DivideCommand, 6, 2, 3, "Division"),
+])
+def test_binary_command(cmd_cls, a, b, expected, description):
+    """Test arithmetic commands and their descriptions"""
+    cmd = cmd_cls()
+    assert cmd.execute(a, b) == expected
+    assert cmd.get_description() == description
 
 def test_divide_by_zero():
     """Test division by zero error"""
@@ -48,72 +51,229 @@ def test_divide_by_zero():
     with pytest.raises(ZeroDivisionError):
         cmd.execute(1, 0)
 
-def test_calculator_execute():
+@pytest.mark.parametrize("name,a,b,expected", [
+    ('add', 2, 3, 5),
+    ('subtract', 5, 3, 2),
+    ('multiply', 4, 3, 12),
+    ('divide', 6, 2, 3),
+])
+def test_calculator_execute(calc, name, a, b, expected):
     """Test calculator command execution"""
-    calc = Calculator()
-    calc.clear_history()  # Start with clean history
+    assert calc.execute_command(name, a, b) == expected
+
+def test_calculator_result_cache(calc, monkeypatch):
+    """Test repeated calculations are served from cache and still recorded"""
+    calls = []
+    original_execute = AddCommand.execute
+
+    def counting_execute(self, a, b):
+        calls.append((a, b))
+        return original_execute(self, a, b)
+
+    monkeypatch.setattr(AddCommand, 'execute', counting_execute)
     assert calc.execute_command('add', 2, 3) == 5
-    assert calc.execute_command('subtract', 5, 3) == 2
-    assert calc.execute_command('multiply', 4, 3) == 12
-    assert calc.execute_command('divide', 6, 2) == 3
+    assert calc.execute_command('add', 3, 2) == 5
+    assert calc.execute_command('add', 2, 3) == 5
+    assert calls == [(2.0, 3.0)]
+    assert calc.execute_command('subtract', 3, 2) == 1
+    assert calc.execute_command('subtract', 2, 3) == -1
+    assert len(calc.get_history()) == 5
+
+    class DoubleAddCommand(AddCommand):
+        """Add command returning twice the sum"""
+        def execute(self, a: float, b: float) -> float:
+            """Add two numbers and double the result"""
+            return 2 * super().execute(a, b)
+
+    calc.register_command('add', DoubleAddCommand())
+    assert calc.execute_command('add', 2, 3) == 10
+
+def test_calculator_result_cache_skips_plugins(calc):
+    """Test commands other than the built-ins are executed on every call"""
+    calls = []
 
-def test_calculator_invalid_command():
+    class CountingCommand(Command):
+        """Command that counts how often it runs"""
+        def execute(self, a: float, b: float) -> float:
+            """Return the number of calls so far"""
+            calls.append((a, b))
+            return float(len(calls))
+
+        def get_description(self) -> str:
+            """Get command description"""
+            return "Counting"
+
+    calc.register_command('count', CountingCommand())
+    assert calc.execute_command('count', 1, 2) == 1
+    assert calc.execute_command('count', 1, 2) == 2
+
+def test_calculator_result_cache_keeps_zero_sign(calc):
+    """Test -0.0 and 0.0 operands do not share cached results"""
+    assert math.copysign(1, calc.execute_command('multiply', -0.0, 5)) == -1
+    assert math.copysign(1, calc.execute_command('multiply', 0.0, 5)) == 1
+
+def test_calculator_invalid_command(calc):
     """Test handling of invalid commands"""
-    calc = Calculator()
     with pytest.raises(ValueError):
         calc.execute_command('invalid', 1, 2)
 
-def test_calculator_history():
+def test_calculator_history(calc):
     """Test calculation history management"""
-    calc = Calculator()
-    calc.clear_history()  # Start with clean history
     calc.execute_command('add', 2, 3)
-    history = calc.get_history()
-    assert len(history) == 1
-    assert history.iloc[0]['operation'] == 'add'
-    # Using literal_eval for safe evaluation of string tuples
-    from ast import literal_eval  # pylint: disable=import-outside-toplevel
-    assert literal_eval(history.iloc[0]['operands']) == (2.0, 3.0)
-    assert history.iloc[0]['result'] == 5
-
-def test_calculator_clear_history():
+    (record,) = calc.get_history()
+    assert isinstance(record.timestamp, datetime)
+    assert record[1:] == ('add', 2.0, 3.0, 5.0)
+    assert record.operands == "(2.0, 3.0)"
+
+def test_calculator_history_filters(calc):
+    """Test filtering history by operation, date and limit"""
+    for value in range(1, 6):
+        calc.execute_command('add', value, 1)
+        calc.execute_command('multiply', value, 1)
+    assert [r.result for r in calc.get_history(limit=3)] == [4, 6, 5]
+    assert [r.result for r in calc.get_history(operation='MULTIPLY')] == [1, 2, 3, 4, 5]
+    assert [r.result for r in calc.get_history(operation='add', limit=2)] == [5, 6]
+    first = calc.get_history()[0].timestamp
+    assert len(calc.get_history(start_date=first)) == 10
+    assert len(calc.get_history(end_date=first)) >= 1
+    assert not calc.get_history(start_date=datetime.max)
+    assert len(calc.get_history(start_date=datetime.min)) == 10
+    assert len(calc.get_history(end_date=datetime.max)) == 10
+    assert not calc.get_history(end_date=datetime.min)
+    assert not calc.get_history(operation='unknown')
+    with pytest.raises(ValueError, match="Limit must not be negative"):
+        calc.get_history(limit=-1)
+    with pytest.raises(ValueError, match="Limit must not be negative"):
+        calc.get_history(operation='add', limit=-1)
+
+def test_calculator_history_stats(calc):
+    """Test history statistics are kept up to date"""
+    assert calc.get_history_stats()['total_calculations'] == 0
+    calc.execute_command('add', 2, 3)
+    calc.execute_command('add', 1, 1)
+    calc.execute_command('multiply', 4, 3)
+    stats = calc.get_history_stats()
+    assert stats['total_calculations'] == 3
+    assert stats['most_used_operation'] == 'add'
+    assert stats['average_result'] == 19 / 3
+    assert stats['operations_count'] == {'add': 2, 'multiply': 1}
+    assert stats['last_calculation'] == calc.get_history()[-1].timestamp
+    assert stats['unique_operations'] == 2
+    calc.clear_history()
+    assert calc.get_history_stats()['total_calculations'] == 0
+
+def test_calculator_non_real_result_leaves_history_alone(calc):
+    """Test a command returning a non-real result does not corrupt the history"""
+    class ComplexCommand(Command):
+        """Command returning a complex number"""
+        def execute(self, a: float, b: float) -> float:
+            """Return a complex number"""
+            return complex(a, b)
+
+        def get_description(self) -> str:
+            """Get command description"""
+            return "Complex"
+
+    calc.execute_command('add', 2, 3)
+    calc.register_command('complex', ComplexCommand())
+    with pytest.raises(TypeError):
+        calc.execute_command('complex', 1, 2)
+    assert [record[1:] for record in calc.get_history()] == [('add', 2.0, 3.0, 5.0)]
+    stats = calc.get_history_stats()
+    assert stats['total_calculations'] == 1
+    assert stats['average_result'] == 5
+    assert stats['operations_count'] == {'add': 1}
+
+def test_calculator_clear_history(calc):
     """Test clearing calculation history"""
-    calc = Calculator()
     calc.execute_command('add', 2, 3)
     calc.clear_history()
     history = calc.get_history()
     assert len(history) == 0
 
-def test_calculator_save_load_history(tmp_path):
+def test_calculator_save_load_history(calc, memory_files):
     """Test saving and loading history"""
-    calc = Calculator()
-    calc.clear_history()  # Start with clean history
     calc.execute_command('add', 2, 3)
-    filename = tmp_path / "test_history.csv"
-    calc.save_history(str(filename))
+    calc.execute_command('divide', 7, 2)
+    saved = calc.get_history()
+    calc.save_history("test_history")
+    assert list(memory_files) == ["test_history.csv"]
     calc.clear_history()
     assert len(calc.get_history()) == 0
-    calc.load_history(str(filename))
+    calc.load_history("test_history")
+    history = calc.get_history()
+    assert [record[1:] for record in history] == [
+        ('add', 2.0, 3.0, 5.0),
+        ('divide', 7.0, 2.0, 3.5),
+    ]
+    assert history == saved
+
+def test_calculator_save_load_history_file(calc, tmp_path):
+    """Test saving and loading history through a real file"""
+    calc.register_command('añadir', AddCommand())
+    calc.execute_command('añadir', 2, 3)
+    calc.execute_command('divide', 7, 2)
+    saved = calc.get_history()
+    path = tmp_path / "history.csv"
+    calc.save_history(str(tmp_path / "history"))
+    contents = path.read_bytes()
+    assert b"\r\n" not in contents
+    assert contents.decode('utf-8').splitlines()[1:] == [
+        f"{saved[0].timestamp.isoformat(sep=' ')},añadir,\"(2.0, 3.0)\",5.0",
+        f"{saved[1].timestamp.isoformat(sep=' ')},divide,\"(7.0, 2.0)\",3.5",
+    ]
+    calc.clear_history()
+    calc.load_history(str(path))
+    assert calc.get_history() == saved
+
+def test_calculator_load_history_column_order(calc, memory_files):
+    """Test loading a history file whose columns are in a different order"""
+    memory_files["reordered.csv"] = (
+        "operation,operands,result,timestamp\n"
+        "add,\"(10.0, 5.0)\",15.0,2025-03-15 17:21:35\n"
+        "power,\"(2.0, 3.0)\",8.0,2025-03-15 17:21:36\n"
+    )
+    calc.load_history("reordered.csv")
     history = calc.get_history()
-    assert len(history) == 1
-    assert history.iloc[0]['operation'] == 'add'
+    assert [r.operation for r in history] == ['add', 'power']
+    assert history[1] == (datetime(2025, 3, 15, 17, 21, 36), 'power', 2.0, 3.0, 8.0)
+    assert calc.get_history_stats()['average_result'] == 11.5
+    assert len(calc.get_history(operation='power')) == 1
+
+def test_calculator_load_history_skips_blank_lines(calc, memory_files):
+    """Test blank lines in a history file are ignored"""
+    memory_files["blank.csv"] = (
+        "timestamp,operation,operands,result\n"
+        "\n"
+        "2025-03-15 17:21:35,add,\"(1.0, 2.0)\",3.0\n"
+        "\n"
+    )
+    calc.load_history("blank.csv")
+    assert [record[1:] for record in calc.get_history()] == [('add', 1.0, 2.0, 3.0)]
+
+def test_calculator_load_invalid_history_keeps_current(calc, memory_files):
+    """Test a file that fails to parse leaves the current history untouched"""
+    calc.execute_command('add', 2, 3)
+    memory_files["invalid.csv"] = (
+        "timestamp,operation,operands,result\n"
+        "2025-03-15 17:21:30,power,\"(2.0, 3.0)\",8.0\n"
+        "2025-03-15 17:21:35,add,\"(1.0, 2.0)\",not-a-number\n"
+    )
+    with pytest.raises(ValueError):
+        calc.load_history("invalid.csv")
+    assert len(calc.get_history()) == 1
+    assert 'power' not in calc.get_history_stats()['operations_count']
+    assert 'power' not in calc._op_codes  # pylint: disable=protected-access
 
-def test_calculator_load_nonexistent_history():
+@pytest.mark.usefixtures("memory_files")
+def test_calculator_load_nonexistent_history(calc):
     """Test loading non-existent history file"""
-    calc = Calculator()
     with pytest.raises(FileNotFoundError):
         calc.load_history("nonexistent.csv")
 
-def test_register_command():
+def test_register_command(calc):
     """Test registering new commands"""
-    calc = Calculator()
-    # Reset calculator to initial state
-    calc._commands = {  # pylint: disable=protected-access
-        'add': AddCommand(),
-        'subtract': SubtractCommand(),
-        'multiply': MultiplyCommand(),
-        'divide': DivideCommand()
-    }
+    before = set(calc.get_available_commands())
 
     class TestCommand(Command):
         """Test command implementation"""
@@ -126,18 +286,11 @@ def test_register_command():
             return "Test command"
     calc.register_command('test', TestCommand())
     commands = calc.get_available_commands()
-    assert len(commands) == 5
-    assert set(commands) == {'add', 'subtract', 'multiply', 'divide', 'test'}
+    assert len(commands) == len(before) + 1
+    assert set(commands) == before | {'test'}
+    assert calc.execute_command('test', 2, 3) == 5
 
-def test_get_available_commands():
+def test_get_available_commands(calc):
     """Test getting available commands"""
-    calc = Calculator()
-    # Reset calculator to initial state
-    calc._commands = {  # pylint: disable=protected-access
-        'add': AddCommand(),
-        'subtract': SubtractCommand(),
-        'multiply': MultiplyCommand(),
-        'divide': DivideCommand()
-    }
     commands = calc.get_available_commands()
     assert set(commands) == {'add', 'subtract', 'multiply', 'divide'}
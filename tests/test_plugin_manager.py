@@ -3,9 +3,8 @@ Test module for the plugin manager functionality.
 
 This module tests plugin discovery, loading, and error handling.
 """
-import pathlib
-from unittest.mock import patch
 import pytest
+from src.calculator import Command
 from src.plugin_mananger import PluginManager, PluginLoadError
 
 class TestCommand:
@@ -18,48 +17,69 @@ class TestCommand:
         """Get command description"""
         return "Test Command"
 
+@pytest.fixture(name="discovered_manager", scope="session")
+def discovered_manager_fixture():
+    """Plugin manager with the bundled plugins discovered once per session"""
+    manager = PluginManager()
+    manager.discover_plugins()
+    return manager
+
+@pytest.fixture(name="fresh_manager")
+def fresh_manager_fixture(discovered_manager, monkeypatch):
+    """Plugin manager with no plugins, restored to the discovered ones afterwards"""
+    monkeypatch.setattr(discovered_manager, '_plugins', {})
+    return discovered_manager
+
 def test_plugin_manager_singleton():
     """Test plugin manager singleton pattern"""
     manager1 = PluginManager()
     manager2 = PluginManager()
     assert manager1 is manager2
 
-def test_discover_plugins():
+def test_discover_plugins(discovered_manager):
     """Test plugin discovery"""
-    manager = PluginManager()
-    manager.discover_plugins()
+    manager = discovered_manager
     assert len(manager._plugins) > 0  # pylint: disable=protected-access
+    plugins = manager.get_plugins()
+    assert all(isinstance(plugin, Command) for plugin in plugins.values())
+    assert manager.get_plugin('powercommand') is plugins['powercommand']
 
-def test_get_plugin():
+def test_discover_plugins_reuses_unchanged_modules(discovered_manager):
+    """Test rediscovery does not re-import unchanged plugin files"""
+    manager = discovered_manager
+    # pylint: disable=protected-access
+    modules = {path: module for path, (_, module) in manager._module_cache.items()}
+    assert modules
+    manager.discover_plugins()
+    for path, (_, module) in manager._module_cache.items():
+        assert module is modules[path]
+
+def test_get_plugin(fresh_manager):
     """Test getting a plugin"""
-    manager = PluginManager()
-    # Reset plugins to ensure clean state
-    manager._plugins = {}  # pylint: disable=protected-access
+    manager = fresh_manager
     # Add a test plugin
-    manager._plugins['test'] = lambda: None  # pylint: disable=protected-access
+    manager._plugins['test'] = TestCommand()  # pylint: disable=protected-access
     plugin = manager.get_plugin('test')
     assert plugin is not None
 
-def test_get_nonexistent_plugin():
+def test_get_nonexistent_plugin(discovered_manager):
     """Test getting a non-existent plugin"""
-    manager = PluginManager()
-    plugin = manager.get_plugin('nonexistent')
+    plugin = discovered_manager.get_plugin('nonexistent')
     assert plugin is None
 
-def test_plugin_load_error():
+def test_plugin_load_error(monkeypatch):
     """Test error handling for invalid plugin files"""
-    manager = PluginManager()
     mock_spec = type('MockSpec', (), {'loader': None})()
-    with patch('importlib.util.spec_from_file_location', return_value=mock_spec):
-        with pytest.raises(PluginLoadError):
-            # pylint: disable=protected-access
-            manager._load_plugin(str(pathlib.Path('nonexistent.py')))
+    monkeypatch.setattr('importlib.util.spec_from_file_location', lambda *args, **kwargs: mock_spec)
+    monkeypatch.setattr('os.path.getmtime', lambda path: 0.0)
+    with pytest.raises(PluginLoadError):
+        PluginManager()._load_plugin('nonexistent.py')  # pylint: disable=protected-access
 
-def test_plugin_registration():
+def test_plugin_registration(fresh_manager, monkeypatch):
     """Test plugin registration"""
-    manager = PluginManager()
-    # pylint: disable=protected-access
-    manager._plugins = {}  # Reset plugins
-    manager._load_plugin = lambda x: None  # Mock _load_plugin
+    manager = fresh_manager
+    monkeypatch.setattr(PluginManager, '_load_plugin', lambda self, path: None)
     manager.discover_plugins()
+    # pylint: disable=protected-access
     assert isinstance(manager._plugins, dict)
+    assert not manager._plugins
@@ -1,108 +1,186 @@
 """test repl"""
 
 import unittest
-from unittest.mock import patch
+from contextlib import contextmanager, redirect_stdout
 from io import StringIO
+from unittest.mock import patch
+import pytest
 
 # Import the CalculatorREPL class here
 from src.repl import CalculatorREPL  # Adjust this import based on your file structure
+from src.calculator import Calculator
+
+@contextmanager
+def capture_stdout():
+    """Capture everything printed to stdout inside the block"""
+    buffer = StringIO()
+    with redirect_stdout(buffer):
+        yield buffer
 
+@pytest.mark.usefixtures("memory_files")
 class TestCalculatorREPL(unittest.TestCase):
     """Test cases for the CalculatorREPL class."""
 
+    @pytest.fixture(autouse=True)
+    def use_memory_files(self, memory_files):
+        """Expose the in-memory history files to the test cases"""
+        self.files = memory_files  # pylint: disable=attribute-defined-outside-init
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one REPL, backed by its own calculator, shared by all test cases"""
+        # pylint: disable=protected-access
+        with patch.object(Calculator, '_instance', Calculator._new_for_tests()):
+            cls.repl = CalculatorREPL()
+
     def setUp(self):
-        """Setup for the test cases"""
-        self.repl = CalculatorREPL()
+        """Start each test case with an empty history"""
+        self.repl.calculator.clear_history()
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_add(self, mock_stdout):
+    def test_add(self):
         """Test the add command"""
-        self.repl.onecmd('add 3 5')
-        output = mock_stdout.getvalue().strip()
-        self.assertEqual(output, "Result: 8.0")
-        self.repl.onecmd('add 3 abc')  # Invalid input
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('add 3 5')
+            output = stdout.getvalue().strip()
+            self.assertEqual(output, "Result: 8.0")
+            self.repl.onecmd('add 3 abc')  # Invalid input
+        output = stdout.getvalue().strip()
         self.assertIn("Error:", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_divide_by_zero(self, mock_stdout):
+    def test_divide_by_zero(self):
         """Test division by zero"""
-        self.repl.onecmd('divide 3 0')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('divide 3 0')
+        output = stdout.getvalue().strip()
         self.assertIn("Error: Cannot divide by zero", output)  # Adjusted error message
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_history(self, mock_stdout):
+    def test_history(self):
         """Test the history command"""
-        self.repl.onecmd('history --limit 5')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('history --limit 5')
+        output = stdout.getvalue().strip()
         self.assertIn("No calculations found", output)  # Assuming no history yet
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_history_with_filters(self, mock_stdout):
+    def test_history_entries(self):
+        """Test the history command lists recorded calculations"""
+        with capture_stdout() as stdout:
+            self.repl.onecmd('add 3 5')
+            self.repl.onecmd('multiply 2 4')
+            self.repl.onecmd('history')
+        lines = stdout.getvalue().strip().splitlines()[2:]
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].endswith("add: (3.0, 5.0) = 8.0"))
+        self.assertTrue(lines[1].endswith("multiply: (2.0, 4.0) = 8.0"))
+
+    def test_history_with_filters(self):
         """Test history with filters"""
-        self.repl.onecmd('history --from 2025-03-01 --operation add --limit 2')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('history --from 2025-03-01 --operation add --limit 2')
+        output = stdout.getvalue().strip()
         self.assertIn("No calculations found", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_history_stats(self, mock_stdout):
+    def test_history_negative_limit(self):
+        """Test a negative limit is rejected on every history path"""
+        with capture_stdout() as stdout:
+            self.repl.onecmd('add 3 5')
+            self.repl.onecmd('history --limit -1')
+            self.repl.onecmd('history --operation add --limit -1')
+        lines = stdout.getvalue().strip().splitlines()[1:]
+        self.assertEqual(lines[0], "Error: Limit must not be negative: -1")
+        self.assertEqual(lines[2], "Error: Limit must not be negative: -1")
+
+    def test_history_stats(self):
         """Test the history stats command"""
-        self.repl.onecmd('history_stats')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('history_stats')
+        output = stdout.getvalue().strip()
         self.assertIn("No calculations found", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_clear_history(self, mock_stdout):
+    def test_clear_history(self):
         """Test clearing history"""
-        self.repl.onecmd('clear_history')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('clear_history')
+        output = stdout.getvalue().strip()
         self.assertEqual(output, "History cleared")
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_save_history(self, mock_stdout):
+    def test_save_history(self):
         """Test saving history to a file"""
-        self.repl.onecmd('save_history test.csv')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('save_history test.csv')
+        output = stdout.getvalue().strip()
         self.assertIn("History saved to test.csv", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_load_history(self, mock_stdout):
+    def test_load_history(self):
         """Test loading history from a file"""
-        self.repl.onecmd('load_history test.csv')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('save_history test.csv')
+            self.repl.onecmd('load_history test.csv')
+        output = stdout.getvalue().strip()
         self.assertIn("History loaded from test.csv", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_quit(self, mock_stdout):
+    def test_load_malformed_history(self):
+        """Test loading a malformed file reports an error and keeps the REPL running"""
+        self.files["bad.csv"] = (
+            "timestamp,operation,operands,result\n"
+            "2025-03-15 17:21:35,add,\"(1.0, 2.0)\",oops\n"
+        )
+        with capture_stdout() as stdout:
+            self.assertFalse(self.repl.onecmd('load_history bad'))
+        output = stdout.getvalue().strip()
+        self.assertIn("Error:", output)
+        self.assertIn("Usage: load_history <filename>", output)
+
+    def test_quit(self):
         """Test the quit command"""
-        self.assertTrue(self.repl.do_quit(''))
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.assertTrue(self.repl.do_quit(''))
+        output = stdout.getvalue().strip()
         self.assertEqual(output, "Goodbye!")
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_help(self, mock_stdout):
+    def test_help(self):
         """Test the help command"""
-        self.repl.onecmd('help')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('help')
+        output = stdout.getvalue().strip()
         self.assertIn("Available commands:", output)
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_plugin_command(self, mock_stdout):
+    def test_plugin_command(self):
         """Test plugin command handling"""
-        self.repl.onecmd('unknown_plugin_command')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.onecmd('unknown_plugin_command')
+        output = stdout.getvalue().strip()
         self.assertIn("Unknown command:", output)
 
+    def test_plugin_execution(self):
+        """Test plugin commands run through the calculator and are recorded"""
+        with capture_stdout() as stdout:
+            self.repl.onecmd('powercommand 2 3')
+            self.repl.onecmd('squarerootcommand 9')
+        output = stdout.getvalue().strip()
+        self.assertEqual(output.splitlines(), ["Result: 8.0", "Result: 3.0"])
+        history = self.repl.calculator.get_history()
+        self.assertEqual([record.operation for record in history],
+                         ['powercommand', 'squarerootcommand'])
+
+    def test_onecmd_dispatch(self):
+        """Test commands, aliases and '?' are dispatched"""
+        with capture_stdout() as stdout:
+            self.assertTrue(self.repl.onecmd('  exit  '))
+            self.assertFalse(self.repl.onecmd(''))
+            self.repl.onecmd('?')
+        output = stdout.getvalue().strip()
+        self.assertIn("Goodbye!", output)
+        self.assertIn("Available commands:", output)
+
     def test_emptyline(self):
         """Test empty line input"""
         self.assertFalse(self.repl.emptyline())
 
-    @patch('sys.stdout', new_callable=StringIO)
-    def test_eof(self, mock_stdout):
+    def test_eof(self):
         """Test EOF handling"""
-        self.repl.do_EOF('')
-        output = mock_stdout.getvalue().strip()
+        with capture_stdout() as stdout:
+            self.repl.do_EOF('')
+        output = stdout.getvalue().strip()
         self.assertEqual(output, "Goodbye!")
 
 
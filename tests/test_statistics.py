@@ -5,13 +5,14 @@ import math
 import pytest
 from plugins.statistics import PowerCommand, SquareRootCommand, LogarithmCommand
 
-def test_power_command():
+@pytest.mark.parametrize("a,b,expected", [(2, 3, 8), (3, 2, 9), (2, 0, 1)])
+def test_power_command(a, b, expected):
     """Test power operation"""
-    cmd = PowerCommand()
-    assert cmd.execute(2, 3) == 8
-    assert cmd.execute(3, 2) == 9
-    assert cmd.execute(2, 0) == 1
-    assert cmd.get_description() == "Power"
+    assert PowerCommand().execute(a, b) == expected
+
+def test_power_description():
+    """Test power command description"""
+    assert PowerCommand().get_description() == "Power"
 
 def test_square_root_command():
     """Test square root operation"""
@@ -21,12 +22,6 @@ def test_square_root_command():
     assert cmd.execute(0) == 0
     assert cmd.get_description() == "Square Root"
 
-def test_square_root_negative():
-    """Test square root of negative number"""
-    cmd = SquareRootCommand()
-    with pytest.raises(ValueError):
-        cmd.execute(-1)
-
 def test_logarithm_command():
     """Test natural logarithm operation"""
     cmd = LogarithmCommand()
@@ -34,10 +29,12 @@ def test_logarithm_command():
     assert cmd.execute(1) == 0
     assert cmd.get_description() == "Natural Logarithm"
 
-def test_logarithm_invalid():
-    """Test logarithm of invalid numbers"""
-    cmd = LogarithmCommand()
-    with pytest.raises(ValueError):
-        cmd.execute(0)
+@pytest.mark.parametrize("cmd_cls,value", [
+    (SquareRootCommand, -1),
+    (LogarithmCommand, 0),
+    (LogarithmCommand, -1),
+])
+def test_domain_errors(cmd_cls, value):
+    """Test square root and logarithm reject values outside their domain"""
     with pytest.raises(ValueError):
-        cmd.execute(-1)
+        cmd_cls().execute(value)